@@ -0,0 +1,111 @@
+"""
+AI PPT 导演系统 - 大数字卡片 Pillow 渲染
+卡片只有圆角矩形和文字，直接用 Pillow 画位图，跳过 matplotlib 的整套渲染流程。
+布局与 generate_big_numbers.py 的 matplotlib 版本一致（共用 grid_shape）。
+"""
+
+from functools import lru_cache
+from pathlib import Path
+
+import matplotlib.font_manager as fm
+from matplotlib.font_manager import FontProperties
+from PIL import Image, ImageDraw, ImageFont
+
+from _fontcache import resolve_font
+
+
+# 字号按磅给出，换算到像素时使用的分辨率（与生成脚本的 DPI 一致）
+DPI = 100
+# 顶部标题区高度（像素）
+TITLE_BAND = 100
+# Pillow 直接写入的位图格式；svg/pdf/eps 等矢量格式需由 matplotlib 渲染
+RASTER_SUFFIXES = {'.png', '.jpg', '.jpeg', '.tif', '.tiff', '.webp', '.gif', '.bmp'}
+# 卡片右上角装饰圆点的直径（像素），与原来30磅的'●'字形大小相当；两种渲染方式共用
+DOT_SIZE_PX = 32
+
+
+@lru_cache(maxsize=None)
+def _font(size_pt, bold=False):
+    """按字号和字重返回缓存的字体，字体文件与 setup_font 选中的字体相同"""
+    family = resolve_font() or 'sans-serif'
+    path = fm.findfont(FontProperties(family=family, weight='bold' if bold else 'normal'))
+    return ImageFont.truetype(path, round(size_pt * DPI / 72))
+
+
+def can_render(output):
+    """output的格式能否由 Pillow 直接写入"""
+    return Path(output).suffix.lower() in RASTER_SUFFIXES
+
+
+def grid_shape(n):
+    """根据卡片数量返回网格布局 (列数, 行数)，两种渲染方式共用"""
+    if n <= 2:
+        return n, 1
+    if n <= 4:
+        return 2, 2
+    return 3, (n + 2) // 3
+
+
+def _blend(rgba, alpha, background=(1.0, 1.0, 1.0)):
+    """把带透明度的颜色预先混合到背景色上，返回 0-255 的 RGB"""
+    return tuple(round(255 * (alpha * c + (1 - alpha) * b)) for c, b in zip(rgba[:3], background))
+
+
+def render_cards(metrics, scheme, title, output, W=1920, H=1080):
+    """生成大数字卡片展示"""
+    cols, rows = grid_shape(len(metrics))
+
+    image = Image.new('RGB', (W, H), 'white')
+    draw = ImageDraw.Draw(image)
+
+    # 标题
+    draw.text((W / 2, H * 0.02), title, font=_font(28, bold=True),
+              fill=_blend(scheme['text_rgba'], 1.0), anchor='mt')
+
+    # 每张卡片占一个网格单元，单元内按 10x10 单位布局
+    cell_w = W / max(cols, 1)
+    cell_h = (H - TITLE_BAND) / rows
+    radius = round(0.3 / 10 * min(cell_w, cell_h))
+
+    # 颜色交替（主色和强调色）
+    colors = [scheme['primary_rgba'], scheme['accent_rgba']]
+
+    for i, metric in enumerate(metrics):
+        row, col = divmod(i, cols)
+        x0 = col * cell_w
+        y0 = TITLE_BAND + row * cell_h
+
+        def at(u, v):
+            """单元内坐标（左下为原点，0-10）转换为像素坐标"""
+            return x0 + u / 10 * cell_w, y0 + (10 - v) / 10 * cell_h
+
+        color = colors[i % 2]
+        card_fill = _blend(color, 0.95)
+
+        # 卡片背景（带圆角）
+        left, top = at(0.2, 9.8)
+        right, bottom = at(9.8, 0.2)
+        draw.rounded_rectangle((left, top, right, bottom), radius=radius, fill=card_fill)
+
+        card_rgba = tuple(c / 255 for c in card_fill)
+
+        # 大数字
+        draw.text(at(5, 6.5), metric['number'], font=_font(48, bold=True),
+                  fill='white', anchor='mm')
+
+        # 标题
+        draw.text(at(5, 4.5), metric['title'], font=_font(20, bold=True),
+                  fill='white', anchor='mm')
+
+        # 描述/增长率
+        draw.text(at(5, 3.0), metric['description'], font=_font(16),
+                  fill=_blend((1, 1, 1), 0.9, card_rgba), anchor='mm')
+
+        # 装饰性小元素（右上角）
+        dot_x, dot_y = at(8.5, 8.5)
+        dot_r = DOT_SIZE_PX / 2
+        draw.ellipse((dot_x - dot_r, dot_y - dot_r, dot_x + dot_r, dot_y + dot_r),
+                     fill=_blend((1, 1, 1), 0.3, card_rgba))
+
+    image.save(output, dpi=(DPI, DPI), compress_level=1)
+    print(f"✓ 大数字卡片已保存: {output}")
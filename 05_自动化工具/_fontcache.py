@@ -0,0 +1,92 @@
+"""
+AI PPT 导演系统 - 中文字体解析与缓存
+三个生成工具共用，首次运行时探测可用字体并写入 ~/.cache/ai-ppt/font.json，
+之后直接读取缓存，跳过字体管理器的逐个查找。
+"""
+
+import json
+import os
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import matplotlib.font_manager as fm
+from matplotlib.font_manager import FontProperties
+
+
+FONT_CANDIDATES = ['PingFang HK', 'PingFang SC', 'Microsoft YaHei', 'SimHei', 'Arial Unicode MS']
+
+CACHE_DIR = Path.home() / '.cache' / 'ai-ppt'
+FONT_CACHE_PATH = CACHE_DIR / 'font.json'
+
+_font_ready = False
+
+# (字号, 字重) -> FontProperties
+_FP_CACHE = {}
+
+
+def _apply_font(family):
+    plt.rcParams['font.sans-serif'] = [family]
+    plt.rcParams['axes.unicode_minus'] = False
+
+
+def _read_cache():
+    try:
+        with open(FONT_CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f).get('family')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _write_cache(family):
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = FONT_CACHE_PATH.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'family': family}, f, ensure_ascii=False)
+        os.replace(tmp_path, FONT_CACHE_PATH)
+    except OSError:
+        # 缓存写入失败不影响本次生成
+        pass
+
+
+def resolve_font():
+    """返回第一个可用的中文字体名称，未找到时返回None"""
+    cached = _read_cache()
+    if cached:
+        return cached
+
+    for font in FONT_CANDIDATES:
+        try:
+            fm.findfont(FontProperties(family=font), fallback_to_default=False)
+        except ValueError:
+            continue
+        _write_cache(font)
+        return font
+
+    return None
+
+
+def setup_font():
+    """设置中文字体（同一进程内只执行一次）"""
+    global _font_ready
+    if _font_ready:
+        return
+    _font_ready = True
+
+    font = resolve_font()
+    if font is None:
+        plt.rcParams['axes.unicode_minus'] = False
+        print("⚠ 未找到中文字体，可能显示为方框")
+        return
+
+    _apply_font(font)
+    print(f"✓ 使用字体: {font}")
+
+
+def font_props(size, weight='normal'):
+    """返回缓存的FontProperties，相同样式的文字不再重复解析字体属性"""
+    key = (size, weight)
+    fp = _FP_CACHE.get(key)
+    if fp is None:
+        fp = _FP_CACHE[key] = FontProperties(size=size, weight=weight)
+    return fp
@@ -0,0 +1,22 @@
+"""
+AI PPT 导演系统 - 命令行数据解析
+三个生成工具共用的 "字段1:字段2:...,字段1:字段2:..." 格式解析
+"""
+
+
+def parse_records(data_str, schema=('number', 'title', 'description'), strict=False, from_right=False):
+    """
+    解析逗号分隔的记录，每条记录按冒号拆成schema中的字段
+    默认从左侧拆分，多余的冒号保留在最后一个字段（自由文本描述）中；
+    from_right为True时从右侧拆分，多余的冒号保留在第一个字段中（用于"类别:数值"）
+    字段数不足的记录会被跳过，strict为True时改为抛出ValueError
+    """
+    arity = len(schema)
+    records = []
+    for item in data_str.split(','):
+        parts = item.rsplit(':', arity - 1) if from_right else item.split(':', arity - 1)
+        if len(parts) == arity:
+            records.append({key: part.strip() for key, part in zip(schema, parts)})
+        elif strict:
+            raise ValueError(f"无法解析数据项: {item}")
+    return records
@@ -0,0 +1,85 @@
+"""
+AI PPT 导演系统 - 后台PNG写入
+主线程只负责把图形栅格化到内存，PNG压缩编码交给后台线程，
+批量生成时编码与下一张图的绘制重叠进行。
+"""
+
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+
+_png_pool = ThreadPoolExecutor(max_workers=2)
+atexit.register(_png_pool.shutdown, wait=True)
+
+_lock = threading.Lock()
+_futures = []
+# 输出路径 -> 写入完成后要执行的回调；写入失败时置为None
+_pending = {}
+# 输出路径 -> 最近一次提交的写入任务
+_latest = {}
+
+
+def _encode(rgba, output, dpi):
+    try:
+        Image.fromarray(rgba).save(output, format='PNG', optimize=False,
+                                   compress_level=1, dpi=(dpi, dpi))
+    except Exception:
+        with _lock:
+            _pending[output] = None
+        raise
+
+    with _lock:
+        callbacks = _pending.pop(output, [])
+    for callback in callbacks:
+        callback()
+
+
+def _wait_previous(output):
+    """同一路径上一次的写入（含回调）完成后才能再次写入，避免两个线程同时写同一文件"""
+    future = _latest.pop(output, None)
+    if future is not None:
+        # 只等待完成，写入失败的异常留给 wait_all 抛出
+        future.exception()
+
+
+def save_png(fig, output, dpi=300):
+    """栅格化fig并在后台写入output；非PNG格式直接同步保存"""
+    output = str(output)
+    _wait_previous(output)
+    if Path(output).suffix.lower() != '.png':
+        fig.savefig(output, dpi=dpi, facecolor='white')
+        return
+
+    fig.set_dpi(dpi)
+    fig.set_facecolor('white')
+    fig.canvas.draw()
+    rgba = np.asarray(fig.canvas.buffer_rgba()).copy()
+
+    with _lock:
+        _pending[output] = []
+    future = _png_pool.submit(_encode, rgba, output, dpi)
+    _futures.append(future)
+    _latest[output] = future
+
+
+def when_saved(output, callback):
+    """output写入完成后执行callback；没有待写入任务时立即执行，写入失败则不执行"""
+    output = str(output)
+    with _lock:
+        if output in _pending:
+            if _pending[output] is not None:
+                _pending[output].append(callback)
+            return
+    callback()
+
+
+def wait_all():
+    """等待所有后台写入完成，写入失败时抛出异常"""
+    _latest.clear()
+    while _futures:
+        _futures.pop(0).result()
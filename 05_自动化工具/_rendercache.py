@@ -0,0 +1,63 @@
+"""
+AI PPT 导演系统 - 渲染结果缓存
+按输入参数、生成代码与渲染环境（字体、matplotlib/Pillow版本）计算内容哈希，
+相同输入的图片直接从 ~/.cache/ai-ppt/ 复制，跳过 matplotlib 渲染。
+修改任一生成脚本或公共模块、安装新字体都会使旧缓存失效。
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import matplotlib
+import PIL
+
+from _fontcache import CACHE_DIR, resolve_font
+
+
+def source_hash(script_path):
+    """计算生成脚本及同目录公共模块（_*.py）的源码哈希"""
+    script_path = Path(script_path).resolve()
+    paths = [script_path] + sorted(script_path.parent.glob('_*.py'))
+    h = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        h.update(path.read_bytes())
+    return h.digest()
+
+
+def cache_key(params, src_hash):
+    """根据参数字典、源码哈希和实际使用的字体生成缓存键"""
+    payload = dict(params,
+                   matplotlib=matplotlib.__version__,
+                   pillow=PIL.__version__,
+                   font=resolve_font())
+    data = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.blake2b(data + src_hash, digest_size=16).hexdigest()
+
+
+def _cache_path(key, output):
+    return CACHE_DIR / f"{key}{Path(output).suffix or '.png'}"
+
+
+def restore(key, output):
+    """缓存命中时复制到output并返回True"""
+    cache_path = _cache_path(key, output)
+    if not cache_path.is_file():
+        return False
+    shutil.copyfile(cache_path, output)
+    return True
+
+
+def store(key, output):
+    """把刚生成的output写入缓存"""
+    cache_path = _cache_path(key, output)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        shutil.copyfile(output, tmp_path)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # 缓存写入失败不影响本次生成
+        pass
@@ -0,0 +1,18 @@
+"""
+AI PPT 导演系统 - 配色方案预处理
+三个生成工具共用，把配色方案中的十六进制颜色预先转换为RGBA元组。
+"""
+
+from matplotlib.colors import to_rgba
+
+
+def add_rgba(schemes):
+    """
+    为每个配色方案的颜色键添加 _rgba 后缀的RGBA版本（列表逐项转换），绘图时不再逐次解析；
+    原十六进制键保留用于打印和缓存键
+    """
+    for scheme in schemes.values():
+        for key, value in list(scheme.items()):
+            if key == 'name':
+                continue
+            scheme[f'{key}_rgba'] = [to_rgba(c) for c in value] if isinstance(value, list) else to_rgba(value)
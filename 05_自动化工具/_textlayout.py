@@ -0,0 +1,55 @@
+"""
+AI PPT 导演系统 - 文字排版缓存
+文字排版（测量、换行、对齐）是 matplotlib 绘制文字的主要开销。
+排版结果只与文字内容、字体和对齐方式有关，与位置无关，
+因此相同标签（如 Q1/Q2/Q3/Q4）在同一进程内只排版一次。
+"""
+
+from matplotlib.text import Text
+
+
+# (文字, 字体, dpi, 旋转, 对齐...) -> Text._get_layout 的返回值
+_LAYOUT_CACHE = {}
+
+
+class CachedLayoutText(Text):
+    """按内容缓存排版结果的 Text"""
+
+    def _layout_key(self):
+        return (
+            self.get_text(),
+            self._fontproperties.copy(),
+            self.figure.dpi,
+            self.get_rotation(),
+            self.get_rotation_mode(),
+            self._horizontalalignment,
+            self._verticalalignment,
+            self._get_multialignment(),
+            self._linespacing,
+        )
+
+    def _get_layout(self, renderer):
+        # 自动换行依赖位置和画布大小，usetex 依赖外部排版，这两种情况不缓存
+        if self.get_wrap() or self.get_usetex():
+            return super()._get_layout(renderer)
+        key = self._layout_key()
+        layout = _LAYOUT_CACHE.get(key)
+        if layout is None:
+            layout = _LAYOUT_CACHE[key] = super()._get_layout(renderer)
+        return layout
+
+
+def fast_text(ax, x, y, s, **kwargs):
+    """与 ax.text 用法相同，但使用排版缓存"""
+    effective_kwargs = {
+        'verticalalignment': 'baseline',
+        'horizontalalignment': 'left',
+        'transform': ax.transData,
+        'clip_on': False,
+        **kwargs,
+    }
+    t = CachedLayoutText(x, y, text=s, **effective_kwargs)
+    if t.get_clip_path() is None:
+        t.set_clip_path(ax.patch)
+    ax._add_text(t)
+    return t
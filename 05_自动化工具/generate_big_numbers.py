@@ -7,11 +7,33 @@ AI PPT 导演系统 - 大数字卡片生成工具
 python generate_big_numbers.py --data "3000万:年度GMV:同比增长150%,10万+:活跃用户:月增长率35%,95%:客户满意度:行业领先水平" --color gold_blue
 """
 
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.backend_bases import FigureCanvasBase
+from matplotlib.colors import to_rgba
 from matplotlib.patches import FancyBboxPatch
 import numpy as np
 import argparse
+from functools import lru_cache
 from pathlib import Path
+from PIL import Image, ImageDraw
+
+from _fontcache import setup_font, font_props
+from _parse import parse_records
+from _schemes import add_rgba
+import _cards_pil
+import _pngwriter
+import _rendercache
+from _textlayout import fast_text
+
+
+# 源码哈希，修改绘图代码后旧的渲染缓存自动失效
+_SOURCE_HASH = _rendercache.source_hash(__file__)
+
+# 输出尺寸：按幻灯片实际像素渲染（默认1920x1080），figsize = 像素 / DPI
+SLIDE_SIZE = (1920, 1080)
+DPI = 100
 
 
 # 配色方案定义
@@ -63,89 +85,55 @@ COLOR_SCHEMES = {
     }
 }
 
+add_rgba(COLOR_SCHEMES)
 
-def setup_font():
-    """设置中文字体"""
-    font_candidates = ['PingFang HK', 'PingFang SC', 'Microsoft YaHei', 'SimHei', 'Arial Unicode MS']
-
-    for font in font_candidates:
-        try:
-            plt.rcParams['font.sans-serif'] = [font]
-            plt.rcParams['axes.unicode_minus'] = False
-            print(f"✓ 使用字体: {font}")
-            return
-        except:
-            continue
-
-    print("⚠ 未找到中文字体，可能显示为方框")
-
-
-def parse_metrics_data(data_str):
-    """
-    解析大数字数据
-    格式: "数值1:标题1:描述1,数值2:标题2:描述2,..."
-    """
-    items = data_str.split(',')
-    metrics = []
-    for item in items:
-        parts = item.split(':')
-        if len(parts) >= 3:
-            number = parts[0].strip()
-            title = parts[1].strip()
-            description = parts[2].strip()
-            metrics.append({
-                'number': number,
-                'title': title,
-                'description': description
-            })
-    return metrics
-
-
-def generate_big_number_cards(metrics, scheme, title="核心指标", output="big_numbers.png"):
-    """生成大数字卡片展示"""
-    n = len(metrics)
 
+@lru_cache(maxsize=None)
+def _dot_tile(color_rgba, size_px=64):
+    """预先用 Pillow 画好的半透明圆点（RGBA数组），所有卡片共用"""
+    rgb = tuple(round(255 * c) for c in color_rgba[:3])
+    # 背景用同色的全透明像素，缩放插值时边缘不会混入黑色
+    tile = Image.new('RGBA', (size_px, size_px), rgb + (0,))
+    ImageDraw.Draw(tile).ellipse((0, 0, size_px - 1, size_px - 1), fill=rgb + (int(255 * 0.3),))
+    return np.asarray(tile)
+
+
+def generate_big_number_cards(metrics, scheme, title="核心指标", output="big_numbers.png", size=SLIDE_SIZE):
+    """生成大数字卡片展示"""
     # 根据卡片数量调整布局
-    if n <= 2:
-        cols = n
-        rows = 1
-        figsize = (7 * cols, 6)
-    elif n <= 4:
-        cols = 2
-        rows = 2
-        figsize = (14, 12)
-    else:
-        cols = 3
-        rows = (n + 2) // 3
-        figsize = (18, 6 * rows)
+    cols, rows = _cards_pil.grid_shape(len(metrics))
+    figsize = (size[0] / DPI, size[1] / DPI)
 
-    fig, axes = plt.subplots(rows, cols, figsize=figsize)
+    # 单个坐标系覆盖整张画布，每张卡片占 10x10 数据单位；顶部留出约1英寸给标题
+    fig = plt.figure(figsize=figsize)
+    ax = fig.add_axes([0, 0, 1, 1 - 1.0 / figsize[1]])
+    ax.set_xlim(0, cols * 10)
+    ax.set_ylim(0, rows * 10)
+    ax.axis('off')
 
     # 标题
-    fig.suptitle(title, fontsize=28, fontweight='bold', color=scheme['text'], y=0.98)
-
-    # 扁平化axes数组
-    if n == 1:
-        axes = [axes]
-    elif rows == 1 or cols == 1:
-        axes = axes.flatten() if n > 1 else [axes]
-    else:
-        axes = axes.flatten()
+    fig.suptitle(title, fontproperties=font_props(28, 'bold'), color=scheme['text_rgba'], y=0.98)
 
     # 颜色交替（主色和强调色）
-    colors = [scheme['primary'], scheme['accent']]
+    colors = [scheme['primary_rgba'], scheme['accent_rgba']]
+
+    # 装饰圆点的半径换算成数据单位（坐标系宽 size[0] 像素、高 size[1]-DPI 像素）
+    dot_tile = _dot_tile(to_rgba('white'))
+    dot_rx = _cards_pil.DOT_SIZE_PX / 2 * cols * 10 / size[0]
+    dot_ry = _cards_pil.DOT_SIZE_PX / 2 * rows * 10 / (size[1] - DPI)
 
-    for i, (ax, metric) in enumerate(zip(axes[:n], metrics)):
-        ax.set_xlim(0, 10)
-        ax.set_ylim(0, 10)
-        ax.axis('off')
+    for i, metric in enumerate(metrics):
+        # 卡片左下角（数据坐标）
+        row, col = divmod(i, cols)
+        cx = col * 10 + 0.5
+        cy = (rows - 1 - row) * 10 + 0.5
 
         # 选择颜色（交替使用）
         color = colors[i % 2]
 
         # 卡片背景（带圆角）
         card = FancyBboxPatch(
-            (0.5, 0.5), 9, 9,
+            (cx, cy), 9, 9,
             boxstyle="round,pad=0.3",
             facecolor=color,
             edgecolor='none',
@@ -154,31 +142,26 @@ def generate_big_number_cards(metrics, scheme, title="核心指标", output="big
         ax.add_patch(card)
 
         # 大数字
-        ax.text(5, 6.5, metric['number'],
-                ha='center', va='center',
-                fontsize=48, fontweight='bold', color='white')
+        fast_text(ax, cx + 4.5, cy + 6.0, metric['number'],
+                  ha='center', va='center',
+                  fontproperties=font_props(48, 'bold'), color='white')
 
         # 标题
-        ax.text(5, 4.5, metric['title'],
-                ha='center', va='center',
-                fontsize=20, fontweight='bold', color='white')
+        fast_text(ax, cx + 4.5, cy + 4.0, metric['title'],
+                  ha='center', va='center',
+                  fontproperties=font_props(20, 'bold'), color='white')
 
         # 描述/增长率
-        ax.text(5, 3.0, metric['description'],
-                ha='center', va='center',
-                fontsize=16, color='white', alpha=0.9)
+        fast_text(ax, cx + 4.5, cy + 2.5, metric['description'],
+                  ha='center', va='center',
+                  fontproperties=font_props(16), color='white', alpha=0.9)
 
         # 装饰性小元素（右上角）
-        ax.text(8.5, 8.5, '●',
-                ha='center', va='center',
-                fontsize=30, color='white', alpha=0.3)
-
-    # 隐藏多余的子图
-    for ax in axes[n:]:
-        ax.axis('off')
+        ax.imshow(dot_tile, extent=(cx + 8.0 - dot_rx, cx + 8.0 + dot_rx,
+                                    cy + 8.0 - dot_ry, cy + 8.0 + dot_ry),
+                  aspect='auto', zorder=5, interpolation='bilinear')
 
-    plt.tight_layout()
-    plt.savefig(output, dpi=300, bbox_inches='tight', facecolor='white')
+    _pngwriter.save_png(fig, output, dpi=DPI)
     print(f"✓ 大数字卡片已保存: {output}")
     plt.close()
 
@@ -211,17 +194,31 @@ def main():
                         default='',
                         help='输出文件名（默认自动生成）')
 
-    args = parser.parse_args()
+    parser.add_argument('--width',
+                        type=int, default=SLIDE_SIZE[0],
+                        help='输出宽度（像素），默认1920')
+
+    parser.add_argument('--height',
+                        type=int, default=SLIDE_SIZE[1],
+                        help='输出高度（像素），默认1080')
 
-    # 设置字体
-    setup_font()
+    parser.add_argument('--renderer',
+                        choices=['pil', 'matplotlib'],
+                        default='pil',
+                        help='渲染方式: pil(默认，直接绘制位图) | matplotlib(旧版渲染)')
+
+    parser.add_argument('--force', '-f',
+                        action='store_true',
+                        help='强制重新生成：不跳过已存在的输出文件，也不使用渲染缓存')
+
+    args = parser.parse_args()
 
     # 获取配色方案
     scheme = COLOR_SCHEMES[args.color]
     print(f"✓ 使用配色方案: {scheme['name']}")
 
     # 解析数据
-    metrics = parse_metrics_data(args.data)
+    metrics = parse_records(args.data, ('number', 'title', 'description'))
     print(f"✓ 数据解析完成: {len(metrics)}个指标")
 
     # 设置输出文件名
@@ -230,8 +227,38 @@ def main():
     else:
         output = f"big_numbers_{args.color}.png"
 
-    # 生成大数字卡片
-    generate_big_number_cards(metrics, scheme, args.title, output)
+    # 矢量格式（svg/pdf等）Pillow无法写入，改用 matplotlib 渲染
+    renderer = args.renderer
+    if renderer == 'pil' and not _cards_pil.can_render(output):
+        renderer = 'matplotlib'
+    suffix = Path(output).suffix.lower()
+    if renderer == 'matplotlib' and suffix and suffix[1:] not in FigureCanvasBase.get_supported_filetypes():
+        parser.error(f'不支持的输出格式: {suffix}')
+
+    # 输出文件已存在时直接跳过（--force 强制重新生成）
+    if Path(output).exists() and not args.force:
+        print(f"✓ 已存在，跳过: {output}")
+        return
+
+    # 相同输入直接复用缓存（--force 时跳过缓存重新绘制）
+    cache_key = _rendercache.cache_key(
+        {'data': args.data, 'color': args.color, 'title': args.title, 'size': [args.width, args.height],
+         'renderer': renderer},
+        _SOURCE_HASH)
+    if not args.force and _rendercache.restore(cache_key, output):
+        print(f"✓ 命中渲染缓存: {output}")
+    elif renderer == 'pil':
+        # 生成大数字卡片
+        _cards_pil.render_cards(metrics, scheme, args.title, output, args.width, args.height)
+        _rendercache.store(cache_key, output)
+    else:
+        # 设置字体
+        setup_font()
+
+        # 生成大数字卡片
+        generate_big_number_cards(metrics, scheme, args.title, output, (args.width, args.height))
+        _pngwriter.when_saved(output, lambda: _rendercache.store(cache_key, output))
+        _pngwriter.wait_all()
 
     print(f"\n✓ 大数字卡片生成成功!")
     print(f"  文件位置: {Path(output).absolute()}")
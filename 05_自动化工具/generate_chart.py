@@ -7,13 +7,32 @@ AI PPT 导演系统 - 图表生成工具
 python generate_chart.py --type bar --data "Q1:85,Q2:92,Q3:88,Q4:95" --color blue
 """
 
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
+from matplotlib.patches import Polygon
+from matplotlib.ticker import MaxNLocator, NullLocator
 import matplotlib.font_manager as fm
 import numpy as np
 import json
 import argparse
 from pathlib import Path
 
+from _fontcache import setup_font, font_props
+from _parse import parse_records
+from _schemes import add_rgba
+import _pngwriter
+import _rendercache
+
+
+# 源码哈希，修改绘图代码后旧的渲染缓存自动失效
+_SOURCE_HASH = _rendercache.source_hash(__file__)
+
+# 输出尺寸：按幻灯片实际像素渲染（默认1920x1080），figsize = 像素 / DPI
+SLIDE_SIZE = (1920, 1080)
+DPI = 100
+
 
 # 配色方案定义（来自 03_视觉规范/配色方案.json）
 COLOR_SCHEMES = {
@@ -67,22 +86,7 @@ COLOR_SCHEMES = {
     }
 }
 
-
-def setup_font():
-    """设置中文字体"""
-    # 尝试多个常用中文字体
-    font_candidates = ['PingFang HK', 'PingFang SC', 'Microsoft YaHei', 'SimHei', 'Arial Unicode MS']
-
-    for font in font_candidates:
-        try:
-            plt.rcParams['font.sans-serif'] = [font]
-            plt.rcParams['axes.unicode_minus'] = False
-            print(f"✓ 使用字体: {font}")
-            return
-        except:
-            continue
-
-    print("⚠ 未找到中文字体，可能显示为方框")
+add_rgba(COLOR_SCHEMES)
 
 
 def beautify_axes(ax, scheme):
@@ -91,8 +95,14 @@ def beautify_axes(ax, scheme):
     ax.spines['right'].set_visible(False)
     ax.spines['left'].set_color('#E0E0E0')
     ax.spines['bottom'].set_color('#E0E0E0')
-    ax.tick_params(colors=scheme['text_light'], which='both')
-    ax.grid(axis='y', color='#F0F0F0', linestyle='-', linewidth=0.5, alpha=0.7)
+    ax.tick_params(colors=scheme['text_light_rgba'], which='major')
+    # 不使用次刻度；主刻度最多5个，减少每次绘制时的刻度计算
+    ax.xaxis.set_minor_locator(NullLocator())
+    ax.yaxis.set_minor_locator(NullLocator())
+    ax.yaxis.set_major_locator(MaxNLocator(5, integer=True))
+    # 不透明网格线，置于数据下方
+    ax.set_axisbelow(True)
+    ax.yaxis.grid(True, color='#F0F0F0', linestyle='-', linewidth=0.5)
 
 
 def parse_data(data_str):
@@ -103,27 +113,43 @@ def parse_data(data_str):
     """
     if ':' in data_str:
         # 格式1
-        items = data_str.split(',')
-        categories = []
-        values = []
-        for item in items:
-            cat, val = item.split(':')
-            categories.append(cat.strip())
-            values.append(float(val.strip()))
+        records = parse_records(data_str, ('category', 'value'), strict=True, from_right=True)
+        categories = [r['category'] for r in records]
+        values = [float(r['value']) for r in records]
         return categories, values
     else:
-        # 格式2
-        values = [float(x.strip()) for x in data_str.split(',')]
+        # 格式2：C层面一次性解析所有数值
+        values = np.fromstring(data_str, sep=',')
+        if len(values) != data_str.count(',') + 1:
+            raise ValueError(f"无法解析数值数据: {data_str}")
+        values = values.tolist()
         categories = [f'项目{i+1}' for i in range(len(values))]
         return categories, values
 
 
-def generate_bar_chart(categories, values, scheme, title="柱状图", output="chart_bar.png"):
+def _prepare_axes(fig, size, **subplot_kw):
+    """
+    准备绘图坐标系，返回 (fig, ax, owns_fig)
+    size为输出像素尺寸 (宽, 高)；fig为None时新建一张图（单张模式），否则清空并复用传入的图（批量模式）
+    """
+    figsize = (size[0] / DPI, size[1] / DPI)
+    owns_fig = fig is None
+    if owns_fig:
+        fig = plt.figure(figsize=figsize)
+    else:
+        fig.clf()
+        fig.set_size_inches(figsize)
+    return fig, fig.add_subplot(**subplot_kw), owns_fig
+
+
+def generate_bar_chart(categories, values, scheme, title="柱状图", output="chart_bar.png",
+                       size=SLIDE_SIZE, fig=None):
     """生成柱状图"""
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax, owns_fig = _prepare_axes(fig, size)
+    vmax = np.asarray(values, dtype=np.float64).max()
 
     # 使用渐变色
-    colors = scheme['gradient'][:len(categories)]
+    colors = scheme['gradient_rgba'][:len(categories)]
     bars = ax.bar(categories, values, color=colors, width=0.6)
 
     # 添加数据标签
@@ -132,66 +158,74 @@ def generate_bar_chart(categories, values, scheme, title="柱状图", output="ch
         ax.text(bar.get_x() + bar.get_width()/2., height,
                 f'{height:.0f}',
                 ha='center', va='bottom',
-                fontsize=20, fontweight='bold', color=scheme['text'])
+                fontproperties=font_props(20, 'bold'), color=scheme['text_rgba'])
 
     # 美化
-    ax.set_ylim(0, max(values) * 1.15)
+    ax.set_ylim(0, vmax * 1.15)
     beautify_axes(ax, scheme)
-    ax.set_title(title, fontsize=24, fontweight='bold', color=scheme['text'], pad=20)
+    ax.set_title(title, fontproperties=font_props(24, 'bold'), color=scheme['text_rgba'], pad=20)
 
-    plt.tight_layout()
-    plt.savefig(output, dpi=300, bbox_inches='tight', facecolor='white')
+    fig.subplots_adjust(left=0.08, right=0.97, top=0.86, bottom=0.08)
+    _pngwriter.save_png(fig, output, dpi=DPI)
     print(f"✓ 柱状图已保存: {output}")
-    plt.close()
+    if owns_fig:
+        plt.close(fig)
 
 
-def generate_line_chart(categories, values, scheme, title="折线图", output="chart_line.png"):
+def generate_line_chart(categories, values, scheme, title="折线图", output="chart_line.png",
+                        size=SLIDE_SIZE, fig=None):
     """生成折线图（带渐变填充）"""
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax, owns_fig = _prepare_axes(fig, size)
+
+    vmax = np.asarray(values, dtype=np.float64).max()
 
     # 绘制折线
     x = np.arange(len(categories))
-    line = ax.plot(x, values, color=scheme['primary'], linewidth=3, marker='o',
-                    markersize=10, markerfacecolor=scheme['primary'],
+    line = ax.plot(x, values, color=scheme['primary_rgba'], linewidth=3, marker='o',
+                    markersize=10, markerfacecolor=scheme['primary_rgba'],
                     markeredgecolor='white', markeredgewidth=2)
 
     # 渐变填充
-    ax.fill_between(x, values, alpha=0.3, color=scheme['primary'])
+    ax.fill_between(x, values, alpha=0.3, color=scheme['primary_rgba'])
 
     # 添加数据标签
     for i, v in enumerate(values):
-        ax.text(i, v + max(values)*0.03, f'{v:.0f}',
+        ax.text(i, v + vmax*0.03, f'{v:.0f}',
                 ha='center', va='bottom',
-                fontsize=18, fontweight='bold', color=scheme['text'])
+                fontproperties=font_props(18, 'bold'), color=scheme['text_rgba'])
 
     # 美化
     ax.set_xticks(x)
     ax.set_xticklabels(categories)
-    ax.set_ylim(0, max(values) * 1.15)
+    ax.set_ylim(0, vmax * 1.15)
     beautify_axes(ax, scheme)
-    ax.set_title(title, fontsize=24, fontweight='bold', color=scheme['text'], pad=20)
+    ax.set_title(title, fontproperties=font_props(24, 'bold'), color=scheme['text_rgba'], pad=20)
 
-    plt.tight_layout()
-    plt.savefig(output, dpi=300, bbox_inches='tight', facecolor='white')
+    fig.subplots_adjust(left=0.08, right=0.97, top=0.86, bottom=0.08)
+    _pngwriter.save_png(fig, output, dpi=DPI)
     print(f"✓ 折线图已保存: {output}")
-    plt.close()
+    if owns_fig:
+        plt.close(fig)
 
 
-def generate_pie_chart(categories, values, scheme, title="饼图", output="chart_pie.png"):
+def generate_pie_chart(categories, values, scheme, title="饼图", output="chart_pie.png",
+                       size=SLIDE_SIZE, fig=None):
     """生成环形图"""
-    fig, ax = plt.subplots(figsize=(10, 6))
+    fig, ax, owns_fig = _prepare_axes(fig, size)
 
     # 使用渐变色
-    colors = scheme['gradient'][:len(categories)]
+    colors = scheme['gradient_rgba'][:len(categories)]
 
     # 突出显示最大值
-    explode = [0.05 if v == max(values) else 0 for v in values]
+    vals = np.asarray(values, dtype=np.float64)
+    explode = np.where(vals == vals.max(), 0.05, 0)
 
-    # 绘制饼图
+    # 绘制饼图（楔形本身即为环形，中心不填充）
     wedges, texts, autotexts = ax.pie(values, labels=categories, colors=colors,
                                         autopct='%1.1f%%', startangle=90,
                                         explode=explode, pctdistance=0.85,
-                                        textprops={'fontsize': 16, 'color': scheme['text']})
+                                        wedgeprops=dict(width=0.30, edgecolor='white'),
+                                        textprops={'fontsize': 16, 'color': scheme['text_rgba']})
 
     # 设置百分比文字样式
     for autotext in autotexts:
@@ -199,33 +233,33 @@ def generate_pie_chart(categories, values, scheme, title="饼图", output="chart
         autotext.set_fontsize(18)
         autotext.set_fontweight('bold')
 
-    # 创建环形（中心空白）
-    centre_circle = plt.Circle((0, 0), 0.70, fc='white')
-    fig.gca().add_artist(centre_circle)
+    ax.set_title(title, fontproperties=font_props(24, 'bold'), color=scheme['text_rgba'], pad=20)
 
-    ax.set_title(title, fontsize=24, fontweight='bold', color=scheme['text'], pad=20)
-
-    plt.tight_layout()
-    plt.savefig(output, dpi=300, bbox_inches='tight', facecolor='white')
+    fig.subplots_adjust(left=0.04, right=0.96, top=0.86, bottom=0.04)
+    _pngwriter.save_png(fig, output, dpi=DPI)
     print(f"✓ 环形图已保存: {output}")
-    plt.close()
+    if owns_fig:
+        plt.close(fig)
 
 
-def generate_donut_chart(categories, values, scheme, title="环形图", output="chart_donut.png"):
+def generate_donut_chart(categories, values, scheme, title="环形图", output="chart_donut.png",
+                         size=SLIDE_SIZE, fig=None):
     """生成环形图（带中心数据）"""
-    fig, ax = plt.subplots(figsize=(10, 8))
+    fig, ax, owns_fig = _prepare_axes(fig, size)
 
     # 使用渐变色
-    colors = scheme['gradient'][:len(categories)]
+    colors = scheme['gradient_rgba'][:len(categories)]
 
     # 突出显示最大值
-    explode = [0.05 if v == max(values) else 0 for v in values]
+    vals = np.asarray(values, dtype=np.float64)
+    explode = np.where(vals == vals.max(), 0.05, 0)
 
-    # 绘制环形图
+    # 绘制环形图（楔形本身即为环形，中心不填充）
     wedges, texts, autotexts = ax.pie(values, labels=categories, colors=colors,
                                         autopct='%1.1f%%', startangle=90,
-                                        explode=explode, pctdistance=0.85,
-                                        textprops={'fontsize': 14, 'color': scheme['text']})
+                                        explode=explode, pctdistance=0.825,
+                                        wedgeprops=dict(width=0.35, edgecolor='white'),
+                                        textprops={'fontsize': 14, 'color': scheme['text_rgba']})
 
     # 设置百分比文字样式
     for autotext in autotexts:
@@ -233,130 +267,123 @@ def generate_donut_chart(categories, values, scheme, title="环形图", output="
         autotext.set_fontsize(16)
         autotext.set_fontweight('bold')
 
-    # 创建环形（中心空白）
-    centre_circle = plt.Circle((0, 0), 0.65, fc='white')
-    fig.gca().add_artist(centre_circle)
-
     # 在中心添加总计
     total = sum(values)
     ax.text(0, 0, f'{total:.0f}', ha='center', va='center',
-            fontsize=36, fontweight='bold', color=scheme['text'])
+            fontproperties=font_props(36, 'bold'), color=scheme['text_rgba'])
     ax.text(0, -0.15, '总计', ha='center', va='center',
-            fontsize=16, color=scheme['text_light'])
+            fontproperties=font_props(16), color=scheme['text_light_rgba'])
 
-    ax.set_title(title, fontsize=24, fontweight='bold', color=scheme['text'], pad=20)
+    ax.set_title(title, fontproperties=font_props(24, 'bold'), color=scheme['text_rgba'], pad=20)
 
-    plt.tight_layout()
-    plt.savefig(output, dpi=300, bbox_inches='tight', facecolor='white')
+    fig.subplots_adjust(left=0.04, right=0.96, top=0.88, bottom=0.04)
+    _pngwriter.save_png(fig, output, dpi=DPI)
     print(f"✓ 环形图已保存: {output}")
-    plt.close()
+    if owns_fig:
+        plt.close(fig)
 
 
-def generate_radar_chart(categories, values, scheme, title="雷达图", output="chart_radar.png"):
+def generate_radar_chart(categories, values, scheme, title="雷达图", output="chart_radar.png",
+                         size=SLIDE_SIZE, fig=None):
     """生成雷达图（能力评估）"""
-    fig, ax = plt.subplots(figsize=(10, 10), subplot_kw=dict(projection='polar'))
+    fig, ax, owns_fig = _prepare_axes(fig, size, projection='polar')
 
     # 计算角度
     angles = np.linspace(0, 2 * np.pi, len(categories), endpoint=False).tolist()
     values_plot = values + [values[0]]  # 闭合图形
     angles += angles[:1]
 
-    # 绘制雷达图
-    ax.plot(angles, values_plot, 'o-', linewidth=2, color=scheme['primary'], label='当前水平')
-    ax.fill(angles, values_plot, alpha=0.25, color=scheme['primary'])
+    # 绘制雷达图：填充与边线共用同一个闭合多边形，数据点单独用一次scatter绘制
+    primary = scheme['primary_rgba']
+    ax.add_patch(Polygon(np.column_stack([angles, values_plot]), closed=True,
+                         facecolor=primary[:3] + (0.25,), edgecolor=primary, linewidth=2,
+                         label='当前水平'))
+    ax.scatter(angles[:-1], values, s=100, c=[primary], edgecolors='white', zorder=5)
 
     # 设置刻度标签
     ax.set_xticks(angles[:-1])
-    ax.set_xticklabels(categories, fontsize=14, color=scheme['text'])
+    ax.set_xticklabels(categories, fontsize=14, color=scheme['text_rgba'])
 
     # 设置Y轴
     ax.set_ylim(0, 100)
     ax.set_yticks([20, 40, 60, 80, 100])
-    ax.set_yticklabels(['20', '40', '60', '80', '100'], fontsize=10, color=scheme['text_light'])
+    ax.set_yticklabels(['20', '40', '60', '80', '100'], fontsize=10, color=scheme['text_light_rgba'])
     ax.grid(color='#E0E0E0', linestyle='-', linewidth=0.5)
 
     # 添加数据标签
     for angle, value, category in zip(angles[:-1], values, categories):
         ax.text(angle, value + 5, f'{value:.0f}',
                 ha='center', va='center',
-                fontsize=12, fontweight='bold', color=scheme['accent'])
+                fontproperties=font_props(12, 'bold'), color=scheme['accent_rgba'])
 
-    ax.set_title(title, fontsize=24, fontweight='bold', color=scheme['text'], pad=30)
+    ax.set_title(title, fontproperties=font_props(24, 'bold'), color=scheme['text_rgba'], pad=30)
 
-    plt.tight_layout()
-    plt.savefig(output, dpi=300, bbox_inches='tight', facecolor='white')
+    fig.subplots_adjust(left=0.10, right=0.90, top=0.88, bottom=0.06)
+    _pngwriter.save_png(fig, output, dpi=DPI)
     print(f"✓ 雷达图已保存: {output}")
-    plt.close()
+    if owns_fig:
+        plt.close(fig)
 
 
-def generate_waterfall_chart(categories, values, scheme, title="瀑布图", output="chart_waterfall.png"):
+def generate_waterfall_chart(categories, values, scheme, title="瀑布图", output="chart_waterfall.png",
+                             size=SLIDE_SIZE, fig=None):
     """生成瀑布图（增长归因分析）"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax, owns_fig = _prepare_axes(fig, size)
 
-    # 计算累计值
-    cumulative = [0]
-    for v in values[:-1]:
-        cumulative.append(cumulative[-1] + v)
+    values_arr = np.asarray(values, dtype=np.float64)
+    n = len(values_arr)
 
-    # 绘制瀑布图
-    colors = []
-    for i, v in enumerate(values):
-        if i == 0 or i == len(values) - 1:
-            colors.append(scheme['primary'])  # 起点和终点用主色
-        elif v >= 0:
-            colors.append(scheme['accent'])  # 正增长用强调色
-        else:
-            colors.append('#FF6B6B')  # 负增长用红色
+    # 计算累计值（每根柱子的起点）；最后一列是总计，从0开始
+    # 只有瀑布图用到，延迟导入，其他图表不加载该模块（及可选的numba）
+    import _waterfall_kernels
+    cumulative, bottoms, signs, y_positions = _waterfall_kernels.compute(values_arr)
+
+    # 正增长用强调色，负增长用红色，起点和终点用主色
+    colors = np.where(signs[:, None], scheme['accent_rgba'], to_rgba('#FF6B6B'))
+    colors[0] = colors[-1] = scheme['primary_rgba']
 
     # 绘制柱子
-    x = np.arange(len(categories))
-    for i, (cat, val, cum) in enumerate(zip(categories, values, cumulative)):
-        if i == len(categories) - 1:
-            # 最后一列是总计，从0开始
-            ax.bar(i, val, bottom=0, color=colors[i], width=0.6)
-        else:
-            ax.bar(i, val, bottom=cum, color=colors[i], width=0.6)
+    x = np.arange(n)
+    ax.bar(x, values_arr, bottom=bottoms, color=colors, width=0.6)
 
     # 连接线
-    for i in range(len(categories) - 2):
-        ax.plot([i + 0.3, i + 0.7], [cumulative[i+1], cumulative[i+1]],
-                'k--', linewidth=1, alpha=0.5)
+    if n > 2:
+        ax.hlines(cumulative[1:-1], x[:-2] + 0.3, x[:-2] + 0.7,
+                  colors='k', linestyles='--', linewidth=1, alpha=0.5)
 
     # 添加数据标签
-    for i, (cat, val, cum) in enumerate(zip(categories, values, cumulative)):
-        if i == len(categories) - 1:
-            y_pos = val / 2
-        else:
-            y_pos = cum + val / 2
-
-        ax.text(i, y_pos, f'{val:+.0f}' if i > 0 and i < len(categories) - 1 else f'{val:.0f}',
+    for i, (val, y_pos) in enumerate(zip(values_arr, y_positions)):
+        ax.text(i, y_pos, f'{val:+.0f}' if 0 < i < n - 1 else f'{val:.0f}',
                 ha='center', va='center',
-                fontsize=16, fontweight='bold', color='white')
+                fontproperties=font_props(16, 'bold'), color='white')
 
     # 美化
     ax.set_xticks(x)
     ax.set_xticklabels(categories, fontsize=12)
     beautify_axes(ax, scheme)
-    ax.set_title(title, fontsize=24, fontweight='bold', color=scheme['text'], pad=20)
+    ax.set_title(title, fontproperties=font_props(24, 'bold'), color=scheme['text_rgba'], pad=20)
 
-    plt.tight_layout()
-    plt.savefig(output, dpi=300, bbox_inches='tight', facecolor='white')
+    fig.subplots_adjust(left=0.07, right=0.98, top=0.86, bottom=0.08)
+    _pngwriter.save_png(fig, output, dpi=DPI)
     print(f"✓ 瀑布图已保存: {output}")
-    plt.close()
+    if owns_fig:
+        plt.close(fig)
 
 
 def generate_comparison_chart(categories, values1, values2, scheme,
                                title="对比图", label1="系列1", label2="系列2",
-                               output="chart_comparison.png"):
+                               output="chart_comparison.png",
+                               size=SLIDE_SIZE, fig=None):
     """生成分组柱状图"""
-    fig, ax = plt.subplots(figsize=(12, 6))
+    fig, ax, owns_fig = _prepare_axes(fig, size)
 
     x = np.arange(len(categories))
     width = 0.35
+    vmax = max(np.max(values1), np.max(values2))
 
     # 绘制两组柱子
-    bars1 = ax.bar(x - width/2, values1, width, label=label1, color=scheme['primary'])
-    bars2 = ax.bar(x + width/2, values2, width, label=label2, color=scheme['accent'])
+    bars1 = ax.bar(x - width/2, values1, width, label=label1, color=scheme['primary_rgba'])
+    bars2 = ax.bar(x + width/2, values2, width, label=label2, color=scheme['accent_rgba'])
 
     # 添加数据标签
     for bars in [bars1, bars2]:
@@ -365,20 +392,153 @@ def generate_comparison_chart(categories, values1, values2, scheme,
             ax.text(bar.get_x() + bar.get_width()/2., height,
                     f'{height:.0f}',
                     ha='center', va='bottom',
-                    fontsize=16, fontweight='bold', color=scheme['text'])
+                    fontproperties=font_props(16, 'bold'), color=scheme['text_rgba'])
 
     # 美化
     ax.set_xticks(x)
     ax.set_xticklabels(categories)
-    ax.set_ylim(0, max(max(values1), max(values2)) * 1.15)
+    ax.set_ylim(0, vmax * 1.15)
     beautify_axes(ax, scheme)
-    ax.set_title(title, fontsize=24, fontweight='bold', color=scheme['text'], pad=20)
+    ax.set_title(title, fontproperties=font_props(24, 'bold'), color=scheme['text_rgba'], pad=20)
     ax.legend(loc='upper left', fontsize=14, frameon=False)
 
-    plt.tight_layout()
-    plt.savefig(output, dpi=300, bbox_inches='tight', facecolor='white')
+    fig.subplots_adjust(left=0.07, right=0.98, top=0.86, bottom=0.08)
+    _pngwriter.save_png(fig, output, dpi=DPI)
     print(f"✓ 对比图已保存: {output}")
-    plt.close()
+    if owns_fig:
+        plt.close(fig)
+
+
+# 图表类型 -> 生成函数
+CHART_GENERATORS = {
+    'bar': generate_bar_chart,
+    'line': generate_line_chart,
+    'pie': generate_pie_chart,
+    'donut': generate_donut_chart,
+    'radar': generate_radar_chart,
+    'waterfall': generate_waterfall_chart,
+}
+
+
+def default_output(chart_type, color):
+    """未指定输出文件时的默认文件名"""
+    return f"chart_{chart_type}_{color}.png"
+
+
+def render_chart(chart_type, data, color='blue', title='', output='', size=SLIDE_SIZE, fig=None,
+                 force=False):
+    """解析参数并生成一张图表（命中缓存时直接复制，force为True时总是重新绘制），返回 (output, scheme)"""
+    # 获取配色方案
+    scheme = COLOR_SCHEMES[color]
+    print(f"✓ 使用配色方案: {scheme['name']}")
+
+    # 解析数据
+    categories, values = parse_data(data)
+    print(f"✓ 数据解析完成: {len(categories)}个数据点")
+
+    # 设置标题
+    title = title if title else f"{scheme['name']} - {chart_type.upper()}图表"
+
+    # 设置输出文件名
+    if not output:
+        output = default_output(chart_type, color)
+
+    # 相同输入直接复用缓存（force 时跳过缓存重新绘制）
+    cache_key = _rendercache.cache_key(
+        {'type': chart_type, 'data': data, 'color': color, 'title': title, 'size': list(size)},
+        _SOURCE_HASH)
+    if not force and _rendercache.restore(cache_key, output):
+        print(f"✓ 命中渲染缓存: {output}")
+    else:
+        # 设置字体
+        setup_font()
+
+        # 生成图表
+        CHART_GENERATORS[chart_type](categories, values, scheme, title, output, size=size, fig=fig)
+        _pngwriter.when_saved(output, lambda: _rendercache.store(cache_key, output))
+
+    return output, scheme
+
+
+def load_batch(batch_path):
+    """
+    读取批量模式的JSONL文件，每行一个图表
+    {"type": "bar", "data": "Q1:85,Q2:92", "color": "blue", "title": "...", "output": "...", "width": 1920, "height": 1080}
+    未指定output的行补上默认文件名。生成前检查所有行：字段缺失或类型错误、图表类型或配色无效、
+    数据无法解析、尺寸不是正整数、多行输出到同一文件时抛出ValueError（注明行号）
+    """
+    jobs = []
+    outputs = {}
+    with open(batch_path, 'r', encoding='utf-8') as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"第{lineno}行: JSON格式错误: {e}") from None
+            if not isinstance(job, dict) or 'type' not in job or 'data' not in job:
+                raise ValueError(f"第{lineno}行: 必须包含 \"type\" 和 \"data\"")
+            for key in ('type', 'data', 'color', 'title', 'output'):
+                if key in job and not isinstance(job[key], str):
+                    raise ValueError(f"第{lineno}行: \"{key}\" 必须是字符串")
+            for key in ('width', 'height'):
+                # bool 是 int 的子类，需单独排除
+                if key in job and (isinstance(job[key], bool) or not isinstance(job[key], int) or job[key] <= 0):
+                    raise ValueError(f"第{lineno}行: \"{key}\" 必须是正整数")
+            if job['type'] not in CHART_GENERATORS:
+                raise ValueError(f"第{lineno}行: 未知的图表类型 {job['type']!r}，"
+                                 f"可选: {', '.join(CHART_GENERATORS)}")
+            if job.get('color', 'blue') not in COLOR_SCHEMES:
+                raise ValueError(f"第{lineno}行: 未知的配色方案 {job['color']!r}，"
+                                 f"可选: {', '.join(COLOR_SCHEMES)}")
+            try:
+                parse_data(job['data'])
+            except ValueError as e:
+                raise ValueError(f"第{lineno}行: 数据无法解析: {e}") from None
+            job['output'] = job.get('output', '') or default_output(job['type'], job.get('color', 'blue'))
+
+            # 同一文件只能由一行生成，否则后台写入会互相覆盖
+            key = Path(job['output']).resolve()
+            if key in outputs:
+                raise ValueError(f"第{lineno}行: 输出文件 {job['output']} 与第{outputs[key]}行重复")
+            outputs[key] = lineno
+
+            jobs.append(job)
+    return jobs
+
+
+def run_batch(jobs, size=SLIDE_SIZE, force=False):
+    """
+    批量模式：依次生成load_batch读取的图表
+    未指定width/height的行使用size；所有图表共用一个Figure，只导入一次matplotlib
+    输出文件已存在的行跳过，force为True时全部重新绘制（也不使用渲染缓存）
+    """
+    skipped = 0
+    fig = plt.figure()
+    try:
+        for i, job in enumerate(jobs, 1):
+            print(f"\n[{i}/{len(jobs)}] {job['type']}")
+            color = job.get('color', 'blue')
+            output = job['output']
+            if Path(output).exists() and not force:
+                print(f"✓ 已存在，跳过: {output}")
+                skipped += 1
+                continue
+            render_chart(job['type'], job['data'],
+                         color=color,
+                         title=job.get('title', ''),
+                         output=output,
+                         size=(job.get('width', size[0]), job.get('height', size[1])),
+                         fig=fig,
+                         force=force)
+    finally:
+        plt.close(fig)
+
+    # 等待后台PNG写入全部完成
+    _pngwriter.wait_all()
+
+    print(f"\n✓ 批量生成完成: {len(jobs) - skipped}张图表" + (f"，跳过{skipped}张已存在" if skipped else ""))
 
 
 def main():
@@ -396,16 +556,17 @@ def main():
   python generate_chart.py --type donut --data "产品A:30,产品B:25,产品C:20,产品D:25" --color gold_blue --title "销售占比"
   python generate_chart.py --type radar --data "战略:85,执行:92,创新:78,协作:88,领导力:90" --color multilayer --title "能力评估"
   python generate_chart.py --type waterfall --data "Q1基准:100,产品增长:+35,市场拓展:+28,成本优化:-8,Q4总计:155" --title "增长归因分析"
+
+  # 批量生成（每行一个JSON对象）
+  python generate_chart.py --batch charts.jsonl
         """
     )
 
     parser.add_argument('--type', '-t',
-                        choices=['bar', 'line', 'pie', 'donut', 'radar', 'waterfall'],
-                        required=True,
+                        choices=list(CHART_GENERATORS),
                         help='图表类型: bar(柱状图) | line(折线图) | pie(饼图) | donut(环形图) | radar(雷达图) | waterfall(瀑布图)')
 
     parser.add_argument('--data', '-d',
-                        required=True,
                         help='数据，格式: "类别1:值1,类别2:值2,..." 或 "值1,值2,..."')
 
     parser.add_argument('--color', '-c',
@@ -421,41 +582,44 @@ def main():
                         default='',
                         help='输出文件名（默认自动生成）')
 
-    args = parser.parse_args()
+    parser.add_argument('--width',
+                        type=int, default=SLIDE_SIZE[0],
+                        help='输出宽度（像素），默认1920')
 
-    # 设置字体
-    setup_font()
+    parser.add_argument('--height',
+                        type=int, default=SLIDE_SIZE[1],
+                        help='输出高度（像素），默认1080')
 
-    # 获取配色方案
-    scheme = COLOR_SCHEMES[args.color]
-    print(f"✓ 使用配色方案: {scheme['name']}")
+    parser.add_argument('--batch', '-b',
+                        default='',
+                        help='批量模式：JSONL文件，每行一个图表 {"type", "data", "color", "title", "output"}')
 
-    # 解析数据
-    categories, values = parse_data(args.data)
-    print(f"✓ 数据解析完成: {len(categories)}个数据点")
+    parser.add_argument('--force', '-f',
+                        action='store_true',
+                        help='强制重新生成：不跳过已存在的输出文件，也不使用渲染缓存')
 
-    # 设置标题
-    title = args.title if args.title else f"{scheme['name']} - {args.type.upper()}图表"
+    args = parser.parse_args()
 
-    # 设置输出文件名
-    if args.output:
-        output = args.output
-    else:
-        output = f"chart_{args.type}_{args.color}.png"
-
-    # 生成图表
-    if args.type == 'bar':
-        generate_bar_chart(categories, values, scheme, title, output)
-    elif args.type == 'line':
-        generate_line_chart(categories, values, scheme, title, output)
-    elif args.type == 'pie':
-        generate_pie_chart(categories, values, scheme, title, output)
-    elif args.type == 'donut':
-        generate_donut_chart(categories, values, scheme, title, output)
-    elif args.type == 'radar':
-        generate_radar_chart(categories, values, scheme, title, output)
-    elif args.type == 'waterfall':
-        generate_waterfall_chart(categories, values, scheme, title, output)
+    if args.batch:
+        try:
+            jobs = load_batch(args.batch)
+        except ValueError as e:
+            parser.error(str(e))
+        run_batch(jobs, (args.width, args.height), force=args.force)
+        return
+
+    if not args.type or not args.data:
+        parser.error('必须提供 --type 和 --data（或使用 --batch）')
+
+    # 输出文件已存在时直接跳过（--force 强制重新生成）
+    output = args.output or default_output(args.type, args.color)
+    if Path(output).exists() and not args.force:
+        print(f"✓ 已存在，跳过: {output}")
+        return
+
+    output, scheme = render_chart(args.type, args.data, args.color, args.title, output,
+                                  size=(args.width, args.height), force=args.force)
+    _pngwriter.wait_all()
 
     print(f"\n✓ 图表生成成功!")
     print(f"  文件位置: {Path(output).absolute()}")
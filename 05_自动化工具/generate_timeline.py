@@ -7,13 +7,32 @@ AI PPT 导演系统 - 时间轴生成工具
 python generate_timeline.py --data "Q1:启动阶段:完成市场调研,Q2:快速增长:用户破10万,Q3:稳步推进:优化产品体验,Q4:总结展望:全年目标达成" --color gold_blue
 """
 
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch
+from matplotlib.patches import Circle, FancyBboxPatch
+from matplotlib.collections import PatchCollection
 import numpy as np
 import argparse
+import textwrap
 from pathlib import Path
 
+from _fontcache import setup_font, font_props
+from _parse import parse_records
+from _schemes import add_rgba
+import _pngwriter
+import _rendercache
+from _textlayout import fast_text
+
+
+# 源码哈希，修改绘图代码后旧的渲染缓存自动失效
+_SOURCE_HASH = _rendercache.source_hash(__file__)
+
+# 输出尺寸：按幻灯片实际像素渲染（默认1920x1080），figsize = 像素 / DPI
+SLIDE_SIZE = (1920, 1080)
+DPI = 100
+
 
 # 配色方案定义
 COLOR_SCHEMES = {
@@ -49,54 +68,19 @@ COLOR_SCHEMES = {
     }
 }
 
+add_rgba(COLOR_SCHEMES)
+
 
-def setup_font():
-    """设置中文字体"""
-    font_candidates = ['PingFang HK', 'PingFang SC', 'Microsoft YaHei', 'SimHei', 'Arial Unicode MS']
-
-    for font in font_candidates:
-        try:
-            plt.rcParams['font.sans-serif'] = [font]
-            plt.rcParams['axes.unicode_minus'] = False
-            print(f"✓ 使用字体: {font}")
-            return
-        except:
-            continue
-
-    print("⚠ 未找到中文字体，可能显示为方框")
-
-
-def parse_timeline_data(data_str):
-    """
-    解析时间轴数据
-    格式: "时间1:标题1:描述1,时间2:标题2:描述2,..."
-    """
-    items = data_str.split(',')
-    timeline = []
-    for item in items:
-        parts = item.split(':')
-        if len(parts) >= 3:
-            time_label = parts[0].strip()
-            title = parts[1].strip()
-            description = parts[2].strip()
-            timeline.append({
-                'time': time_label,
-                'title': title,
-                'description': description
-            })
-    return timeline
-
-
-def generate_horizontal_timeline(timeline, scheme, title="时间轴", output="timeline.png"):
+def generate_horizontal_timeline(timeline, scheme, title="时间轴", output="timeline.png", size=SLIDE_SIZE):
     """生成水平时间轴（带底部数据卡片）"""
-    fig, ax = plt.subplots(figsize=(14, 8))
+    fig, ax = plt.subplots(figsize=(size[0] / DPI, size[1] / DPI))
     ax.set_xlim(0, 10)
     ax.set_ylim(0, 10)
     ax.axis('off')
 
     # 标题
     ax.text(5, 9.2, title, ha='center', va='top',
-            fontsize=26, fontweight='bold', color=scheme['text'])
+            fontproperties=font_props(26, 'bold'), color=scheme['text_rgba'])
 
     # 时间轴主线
     line_y = 6.5
@@ -106,54 +90,52 @@ def generate_horizontal_timeline(timeline, scheme, title="时间轴", output="ti
     n = len(timeline)
     x_positions = np.linspace(1.5, 8.5, n)
 
-    # 绘制时间节点和连接线
-    colors = scheme['colors'][:n]
-    for i, (x, item, color) in enumerate(zip(x_positions, timeline, colors)):
-        # 时间节点圆圈
-        circle = plt.Circle((x, line_y), 0.2, color=color, zorder=3)
-        ax.add_patch(circle)
-
-        # 内圈白色
-        inner_circle = plt.Circle((x, line_y), 0.12, color='white', zorder=4)
-        ax.add_patch(inner_circle)
-
-        # 时间标签（上方）
-        ax.text(x, line_y + 0.5, item['time'],
-                ha='center', va='bottom',
-                fontsize=16, fontweight='bold', color=color)
-
-        # 阶段标题（下方）
-        ax.text(x, line_y - 0.5, item['title'],
-                ha='center', va='top',
-                fontsize=14, fontweight='bold', color=scheme['text'])
-
     # 底部数据卡片区域
     card_y_start = 4.0
     card_width = (8.5 - 1.5) / n - 0.2
     card_height = 2.5
 
-    for i, (x, item, color) in enumerate(zip(x_positions, timeline, colors)):
-        # 卡片背景
-        card = FancyBboxPatch(
-            (x - card_width/2, card_y_start - card_height),
-            card_width, card_height,
-            boxstyle="round,pad=0.1",
-            facecolor=color,
-            edgecolor='none',
-            alpha=0.9,
-            zorder=2
-        )
-        ax.add_patch(card)
+    # 描述文字预先按卡片宽度折行：卡片宽度换算成磅，按中文字宽≈字号估算每行字数
+    desc_fontsize = 11
+    axes_width_pt = size[0] / DPI * (0.98 - 0.02) * 72
+    char_budget = max(1, int(card_width / 10 * axes_width_pt / desc_fontsize))
+
+    # 时间节点圆圈、内圈白色和卡片背景各合并为一个集合，一次绘制
+    palette = scheme['colors_rgba']
+    colors = [palette[i % len(palette)] for i in range(n)]
+    outer = [Circle((x, line_y), 0.2) for x in x_positions]
+    inner = [Circle((x, line_y), 0.12) for x in x_positions]
+    cards = [FancyBboxPatch((x - card_width/2, card_y_start - card_height),
+                            card_width, card_height,
+                            boxstyle="round,pad=0.1")
+             for x in x_positions]
+
+    ax.add_collection(PatchCollection(outer, facecolors=colors, edgecolors='none',
+                                      match_original=False, zorder=3))
+    ax.add_collection(PatchCollection(inner, facecolors='white', edgecolors='none',
+                                      match_original=False, zorder=4))
+    ax.add_collection(PatchCollection(cards, facecolors=colors, edgecolors='none',
+                                      alpha=0.9, match_original=False, zorder=2))
+
+    for x, item, color in zip(x_positions, timeline, colors):
+        # 时间标签（上方）
+        fast_text(ax, x, line_y + 0.5, item['time'],
+                  ha='center', va='bottom',
+                  fontproperties=font_props(16, 'bold'), color=color)
+
+        # 阶段标题（下方）
+        fast_text(ax, x, line_y - 0.5, item['title'],
+                  ha='center', va='top',
+                  fontproperties=font_props(14, 'bold'), color=scheme['text_rgba'])
 
         # 卡片内容（描述文字）
-        ax.text(x, card_y_start - card_height/2, item['description'],
-                ha='center', va='center',
-                fontsize=11, color='white',
-                fontweight='bold',
-                wrap=True)
-
-    plt.tight_layout()
-    plt.savefig(output, dpi=300, bbox_inches='tight', facecolor='white')
+        fast_text(ax, x, card_y_start - card_height/2,
+                  textwrap.fill(item['description'], width=char_budget),
+                  ha='center', va='center',
+                  fontproperties=font_props(desc_fontsize, 'bold'), color='white')
+
+    fig.subplots_adjust(left=0.02, right=0.98, top=0.98, bottom=0.02)
+    _pngwriter.save_png(fig, output, dpi=DPI)
     print(f"✓ 时间轴已保存: {output}")
     plt.close()
 
@@ -186,17 +168,26 @@ def main():
                         default='',
                         help='输出文件名（默认自动生成）')
 
-    args = parser.parse_args()
+    parser.add_argument('--width',
+                        type=int, default=SLIDE_SIZE[0],
+                        help='输出宽度（像素），默认1920')
 
-    # 设置字体
-    setup_font()
+    parser.add_argument('--height',
+                        type=int, default=SLIDE_SIZE[1],
+                        help='输出高度（像素），默认1080')
+
+    parser.add_argument('--force', '-f',
+                        action='store_true',
+                        help='强制重新生成：不跳过已存在的输出文件，也不使用渲染缓存')
+
+    args = parser.parse_args()
 
     # 获取配色方案
     scheme = COLOR_SCHEMES[args.color]
     print(f"✓ 使用配色方案: {scheme['name']}")
 
     # 解析数据
-    timeline = parse_timeline_data(args.data)
+    timeline = parse_records(args.data, ('time', 'title', 'description'))
     print(f"✓ 数据解析完成: {len(timeline)}个时间节点")
 
     # 设置输出文件名
@@ -205,8 +196,25 @@ def main():
     else:
         output = f"timeline_{args.color}.png"
 
-    # 生成时间轴
-    generate_horizontal_timeline(timeline, scheme, args.title, output)
+    # 输出文件已存在时直接跳过（--force 强制重新生成）
+    if Path(output).exists() and not args.force:
+        print(f"✓ 已存在，跳过: {output}")
+        return
+
+    # 相同输入直接复用缓存（--force 时跳过缓存重新绘制）
+    cache_key = _rendercache.cache_key(
+        {'data': args.data, 'color': args.color, 'title': args.title, 'size': [args.width, args.height]},
+        _SOURCE_HASH)
+    if not args.force and _rendercache.restore(cache_key, output):
+        print(f"✓ 命中渲染缓存: {output}")
+    else:
+        # 设置字体
+        setup_font()
+
+        # 生成时间轴
+        generate_horizontal_timeline(timeline, scheme, args.title, output, (args.width, args.height))
+        _pngwriter.when_saved(output, lambda: _rendercache.store(cache_key, output))
+        _pngwriter.wait_all()
 
     print(f"\n✓ 时间轴生成成功!")
     print(f"  文件位置: {Path(output).absolute()}")